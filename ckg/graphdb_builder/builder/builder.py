@@ -42,10 +42,10 @@ def run_minimal_update(user, n_jobs=3):
     return True
 
 
-def run_full_update(user='ckg', download=True, n_jobs=3):
+def run_full_update(user='ckg', download=True, n_jobs=3, output_format='tsv'):
     logger.info("The user {} chose to perform a full build".format(user))
     logger.info("Building database > step 1: Importing data from ontologies, databases and experiments")
-    importer.fullImport(download=download, n_jobs=n_jobs)
+    importer.fullImport(download=download, n_jobs=n_jobs, output_format=output_format)
     logger.info("Building database > step 2: Loading all data imported into the database")
     loader.fullUpdate()
 
@@ -73,6 +73,7 @@ def set_arguments():
     parser.add_argument("-d", "--data", help="If only import, define which ontology/ies, experiment/s or database/s you want to import",  nargs='+', default=None)
     parser.add_argument("-s", "--specific", help="If only loading, define which ontology/ies, projects you want to load",  nargs='+', default=[])
     parser.add_argument("-n", "--n_jobs", help="define number of cores used when importing data", type=int, default=4)
+    parser.add_argument("-f", "--format", help="define the format of the import files. 'parquet' saves columnar copies alongside the tsvs loaded into the database", type=str, choices=['tsv', 'parquet'], default='tsv')
     parser.add_argument("-w", "--download", help="define whether or not to download imported data", type=str, default="True")
     parser.add_argument("-u", "--user", help="Specify a user name to keep track of who is building the database", type=str, required=True)
 
@@ -83,7 +84,7 @@ def main():
     args = parser.parse_args()
     download = str(args.download).lower() == "true"
     if args.build_type == 'full':
-        run_full_update(args.user, args.n_jobs, download)
+        run_full_update(user=args.user, download=download, n_jobs=args.n_jobs, output_format=args.format)
     elif args.build_type == 'minimal':
         run_minimal_update(args.user, args.n_jobs)
     elif args.build_type == 'import':
@@ -106,7 +107,7 @@ def main():
                         if len(valid_entities) > 0:
                             logger.info("These entities will be imported: {}".format(", ".join(valid_entities)))
                             print("These entities will be imported: {}".format(", ".join(valid_entities)))
-                            importer.databasesImport(databases=valid_entities, n_jobs=args.n_jobs, download=download)
+                            importer.databasesImport(databases=valid_entities, n_jobs=args.n_jobs, download=download, output_format=args.format)
                         else:
                             logger.error("The indicated entities (--data) cannot be imported: {}".format(args.data))
                             print("The indicated entities (--data) cannot be imported: {}".format(args.data))
@@ -119,7 +120,7 @@ def main():
                         if len(valid_entities) > 0:
                             logger.info("These entities will be imported: {}".format(", ".join(valid_entities)))
                             print("These entities will be loaded into the database: {}".format(", ".join(valid_entities)))
-                            importer.ontologiesImport(ontologies=valid_entities, download=download)
+                            importer.ontologiesImport(ontologies=valid_entities, download=download, output_format=args.format)
                         else:
                             logger.error("The indicated entities (--data) cannot be imported: {}".format(args.data))
                             print("The indicated entities (--data) cannot be imported: {}".format(args.data))
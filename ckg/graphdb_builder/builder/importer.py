@@ -2,15 +2,20 @@
     Generates all the import files: Ontologies, Databases and Experiments.
     The module is reponsible for generating all the csv files that will
     be loaded into the Graph database and also updates a stats object
-    (hdf table) with the number of entities and relationships from each
-    dataset imported. A new stats object is created the first time a
-    full import is run.
+    (a directory of Parquet files) with the number of entities and
+    relationships from each dataset imported. Every import writes its
+    statistics as a new file, so appends never rewrite previous imports.
 
 """
 
-import os.path
-from datetime import datetime
+import contextlib
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from joblib import Parallel, delayed
 from uuid import uuid4
 from ckg import ckg_utils
@@ -30,10 +35,28 @@ try:
 except Exception as err:
     logger.error("importer - Reading configuration > {}.".format(err))
 
-START_TIME = datetime.now()
+STATS_NUMERIC_TYPES = {'file_size': pa.int64(), 'Imported_number': pa.int64()}
+STATS_SCHEMA = pa.schema([(col, STATS_NUMERIC_TYPES.get(col, pa.string())) for col in config["statsCols"]] +
+                         [('import_id', pa.string()), ('Import_flag', pa.string())])
+STATS_DIRECTORY = ckg_config['stats_directory']
+STATS_SUFFIX = 'stats_' + str(ckg_config['version']).replace('.', '_')
 
 
-def ontologiesImport(ontologies=None, download=True, import_type="partial"):
+@contextlib.contextmanager
+def phase(name):
+    """
+    Context manager that logs how long an import phase took, measured with a \
+    monotonic clock so the timings are comparable across runs and unaffected \
+    by wall-clock drift during long imports.
+
+    :param str name: name of the import phase.
+    """
+    start = time.perf_counter()
+    yield
+    logger.info("Full import: %s took %.3fs", name, time.perf_counter() - start)
+
+
+def ontologiesImport(ontologies=None, download=True, import_type="partial", write=True, output_format='tsv'):
     """
     Generates all the entities and relationships from the provided ontologies. If the ontologies list is\
     not provided, then all the ontologies listed in the configuration will be imported (full_import). \
@@ -42,16 +65,24 @@ def ontologiesImport(ontologies=None, download=True, import_type="partial"):
     :param list ontologies: a list of ontology names to be imported.
     :param bool download: wether database is to be downloaded.
     :param str import_type: type of import (´full´ or ´partial´).
+    :param bool write: wether the collected stats are written to the stats object. When False, \
+                writing is deferred to the caller so stats from several importers can be \
+                appended in one batch.
+    :param str output_format: when 'parquet', columnar copies of the import files are \
+                saved alongside the tsvs loaded into the graph database.
+    :return: Set of tuples with the statistics collected from the imported ontologies.
     """
     ontologiesImportDirectory = ckg_config['imports_ontologies_directory']
     builder_utils.checkDirectory(ontologiesImportDirectory)
-    stats = oh.generate_graphFiles(ontologiesImportDirectory, ontologies, download)
-    statsDf = generateStatsDataFrame(stats)
-    setupStats(import_type=import_type)
-    writeStats(statsDf, import_type)
+    stats = oh.generate_graphFiles(ontologiesImportDirectory, ontologies, download, output_format=output_format)
+    if write:
+        setupStats(import_type=import_type)
+        writeStats(stats, import_type)
+
+    return stats
 
 
-def databasesImport(databases=None, n_jobs=1, download=True, import_type="partial"):
+def databasesImport(databases=None, n_jobs=1, download=True, import_type="partial", write=True, output_format='tsv'):
     """
     Generates all the entities and relationships from the provided databases. If the databases list is\
     not provided, then all the databases listed in the configuration will be imported (full_import).\
@@ -60,62 +91,82 @@ def databasesImport(databases=None, n_jobs=1, download=True, import_type="partia
     :param list databases: a list of database names to be imported.
     :param int n_jobs: number of jobs to run in parallel. 1 by default when updating one database.
     :param str import_type: type of import (´full´ or ´partial´).
+    :param bool write: wether the collected stats are written to the stats object. When False, \
+                writing is deferred to the caller so stats from several importers can be \
+                appended in one batch.
+    :param str output_format: when 'parquet', columnar copies of the import files are \
+                saved alongside the tsvs loaded into the graph database.
+    :return: Set of tuples with the statistics collected from the imported databases.
     """
     databasesImportDirectory = ckg_config['imports_databases_directory']
     builder_utils.checkDirectory(databasesImportDirectory)
-    stats = dh.generateGraphFiles(databasesImportDirectory, databases, download, n_jobs)
-    statsDf = generateStatsDataFrame(stats)
-    setupStats(import_type=import_type)
-    writeStats(statsDf, import_type)
+    stats = dh.generateGraphFiles(databasesImportDirectory, databases, download, n_jobs, output_format=output_format)
+    if write:
+        setupStats(import_type=import_type)
+        writeStats(stats, import_type)
+
+    return stats
 
 
-def experimentsImport(projects=None, n_jobs=1, import_type="partial"):
+def experimentsImport(projects=None, n_jobs=1, import_type="partial", write=True):
     """
     Generates all the entities and relationships from the specified Projects. If the projects list is\
     not provided, then all the projects the experiments directory will be imported (full_import). \
     Calls function experimentImport.
 
     :param list projects:  list of project identifiers to be imported.
-    :param int n_jobs: number of jobs to run in parallel. 1 by default when updating one project.
+    :param int n_jobs: number of jobs to run in parallel. 1 by default when updating one project. \
+                If None, the number of jobs is sized to the available cores and the number \
+                of projects.
     :param str import_type: type of import (´full´ or ´partial´).
+    :param bool write: wether the collected stats are written to the stats object. When False, \
+                writing is deferred to the caller so stats from several importers can be \
+                appended in one batch.
+    :return: Set of tuples with the statistics collected from the imported projects.
     """
     experiments_import_directory = ckg_config['imports_experiments_directory']
     builder_utils.checkDirectory(experiments_import_directory)
     experiments_directory = ckg_config['experiments_directory']
     if projects is None:
         projects = builder_utils.listDirectoryFolders(experiments_directory)
-    if len(projects) > 0:
-        Parallel(n_jobs=n_jobs)(delayed(experimentImport)(experiments_import_directory, experiments_directory, project) for project in projects)
-
-
-def experimentImport(importDirectory, experimentsDirectory, project):
+    stats = set()
+    n = len(projects)
+    if n > 0:
+        ncpus = os.cpu_count()
+        if n_jobs is None:
+            n_jobs = ncpus
+        n_jobs = min(n_jobs, n)
+        if n < 3 or n_jobs == 1:
+            for project in projects:
+                stats.update(experimentImport(experiments_import_directory, experiments_directory, project))
+        else:
+            batch_size = max(1, n // (n_jobs * 4))
+            # projects already run in parallel here, so each one only gets a
+            # couple of threads for its datasets to avoid nested oversubscription
+            project_stats = Parallel(n_jobs=n_jobs, prefer='threads', batch_size=batch_size)(delayed(experimentImport)(experiments_import_directory, experiments_directory, project, max_workers=2) for project in projects)
+            stats.update(*project_stats)
+    if write:
+        setupStats(import_type=import_type)
+        writeStats(stats, import_type)
+
+    return stats
+
+
+def experimentImport(importDirectory, experimentsDirectory, project, max_workers=None):
     """
     Generates all the entities and relationships from the specified Project. Called from function experimentsImport.
 
     :param str importDirectory: path to the directory where all the import files are generated.
     :param str experimentDirectory: path to the directory where all the experiments are located.
     :param str project: identifier of the project to be imported.
+    :param int max_workers: number of threads used to parse the project datasets.
+    :return: Set of tuples with the statistics collected from the project datasets.
     """
     projectPath = os.path.join(importDirectory, project)
-    builder_utils.checkDirectory(projectPath)
     projectDirectory = os.path.join(experimentsDirectory, project)
     datasets = builder_utils.listDirectoryFolders(projectDirectory)
-    if 'project' in datasets:
-        dataset = 'project'
-        datasetPath = os.path.join(projectPath, dataset)
-        builder_utils.checkDirectory(datasetPath)
-        eh.generate_dataset_imports(project, dataset, datasetPath)
-        datasets.remove(dataset)
-        if 'experimental_design' in datasets:
-            dataset = 'experimental_design'
-            datasetPath = os.path.join(projectPath, dataset)
-            builder_utils.checkDirectory(datasetPath)
-            eh.generate_dataset_imports(project, dataset, datasetPath)
-            datasets.remove(dataset)
-            for dataset in datasets:
-                datasetPath = os.path.join(projectPath, dataset)
-                builder_utils.checkDirectory(datasetPath)
-                eh.generate_dataset_imports(project, dataset, datasetPath)
+
+    return eh.generate_dataset_imports_batch(project, datasets, projectPath, max_workers=max_workers)
 
 
 
@@ -130,26 +181,38 @@ def usersImport(import_type='partial'):
     uh.parseUsersFile(expiration=365)
 
 
-def fullImport(download=True, n_jobs=4):
+def fullImport(download=True, n_jobs=4, output_format='tsv'):
     """
     Calls the different importer functions: Ontologies, databases, \
     experiments. The first step is to check if the stats object exists \
     and create it otherwise. Calls setupStats.
+
+    :param bool download: wether the data is to be downloaded.
+    :param int n_jobs: number of jobs to run in parallel.
+    :param str output_format: when 'parquet', columnar copies of the ontology and \
+                database import files are saved alongside the tsvs loaded into the \
+                graph database.
     """
     try:
         setupStats(import_type='full')
-        logger.info("Full import: importing all Ontologies")
-        ontologiesImport(download=download, import_type='full')
-        logger.info("Full import: Ontologies import took {}".format(datetime.now() - START_TIME))
-        logger.info("Full import: importing all Databases")
-        databasesImport(n_jobs=n_jobs, download=download, import_type='full')
-        logger.info("Full import: Databases import took {}".format(datetime.now() - START_TIME))
-        logger.info("Full import: importing all Experiments")
-        experimentsImport(n_jobs=n_jobs, import_type='full')
-        logger.info("Full import: Experiments import took {}".format(datetime.now() - START_TIME))
+        logger.info("Full import: importing all Ontologies, Databases and Experiments")
+
+        def graphImport():
+            # several database parsers read the ontology mapping files, which
+            # the ontologies stage deletes and rewrites, so databases can only
+            # start once ontologies are done
+            ontologies_stats = ontologiesImport(download=download, import_type='full', write=False, output_format=output_format)
+            return ontologies_stats | databasesImport(n_jobs=n_jobs, download=download, import_type='full', write=False, output_format=output_format)
+
+        with phase('Ontologies, Databases and Experiments imports'):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [executor.submit(graphImport),
+                           executor.submit(experimentsImport, n_jobs=None, import_type='full', write=False)]
+                stats = set().union(*[future.result() for future in futures])
         logger.info("Full import: importing all Users")
-        usersImport(import_type='full')
-        logger.info("Full import: Users import took {}".format(datetime.now() - START_TIME))
+        with phase('Users import'):
+            usersImport(import_type='full')
+        writeStats(stats, import_type='full')
     except FileNotFoundError as err:
         logger.error("Full import > {}.".format(err))
     except EOFError as err:
@@ -166,85 +229,96 @@ def fullImport(download=True, n_jobs=4):
         logger.error("Full import > {}.".format(err))
 
 
-def generateStatsDataFrame(stats):
+def generateStatsRecordBatch(stats, import_type):
     """
-    Generates a dataframe with the stats from each import.
+    Builds an Arrow record batch from the collected stats tuples. The tuples are \
+    transposed once into one list per column and handed to the Arrow builders \
+    directly, so the batch is a single columnar copy with no intermediate pandas \
+    DataFrame or block consolidation.
+
     :param list stats: a list with statistics collected from each importer function.
-    :return: Pandas dataframe with the collected statistics.
+    :param str import_type: type of import (´full´ or ´partial´).
+    :return: pyarrow RecordBatch with the collected statistics.
     """
-    statsDf = pd.DataFrame.from_records(list(stats), columns=config["statsCols"])
-    statsDf['import_id'] = import_id
-    statsDf['import_id'] = statsDf['import_id'].astype('str')
+    statsCols = config["statsCols"]
+    stats = list(stats)
+    if len(stats) > 0:
+        columns = {col: list(values) for col, values in zip(statsCols, zip(*stats))}
+    else:
+        columns = {col: [] for col in statsCols}
+    for col in STATS_NUMERIC_TYPES:
+        columns[col] = [int(value) if value else 0 for value in columns[col]]
+    columns['import_id'] = [str(import_id)] * len(stats)
+    columns['Import_flag'] = [import_type] * len(stats)
+    arrays = [pa.array(columns[field.name], type=field.type) for field in STATS_SCHEMA]
 
-    return statsDf
+    return pa.RecordBatch.from_arrays(arrays, schema=STATS_SCHEMA)
 
 
 def setupStats(import_type):
     """
-    Creates a stats object that will collect all the statistics collected from each import.
+    Creates the directory where the statistics collected from each import are stored.
     """
-    statsDirectory = ckg_config['stats_directory']
-    statsFile = os.path.join(statsDirectory, config["statsFile"])
-    statsCols = config["statsCols"]
-    statsName = getStatsName(import_type)
     try:
-        if not os.path.exists(statsDirectory) or not os.path.isfile(statsFile):
-            if not os.path.exists(statsDirectory):
-                os.makedirs(statsDirectory)
-            createEmptyStats(statsCols, statsFile, statsName)
+        if not os.path.exists(STATS_DIRECTORY):
+            os.makedirs(STATS_DIRECTORY)
     except Exception as err:
-        logger.error("Setting up Stats object {} in file:{} > {}.".format(statsName, statsFile, err))
+        logger.error("Setting up Stats directory:{} > {}.".format(STATS_DIRECTORY, err))
 
 
-def createEmptyStats(statsCols, statsFile, statsName):
+def loadStats(stats_directory=None):
     """
-    Creates a HDFStore object with a empty dataframe with the collected stats columns.
-
-    :param list statsCols: a list of columns with the fields collected from the import statistics.
-    :param str statsFile: path where the object should be stored.
-    :param str statsName: name if the file containing the stats object.
-    """
-    try:
-        statsDf = pd.DataFrame(columns=statsCols)
-        with pd.HDFStore(statsFile, mode='w') as hdf:
-            hdf.put(statsName, statsDf, format='table', data_columns=True)
-    except Exception as err:
-        logger.error("Creating empty Stats object {} in file:{} > {}.".format(statsName, statsFile, err))
+    Loads the statistics collected from all imports into a single dataframe. Statistics \
+    accumulated by previous versions in the 'stats.hdf' file are loaded as well, so the \
+    import history is kept after an upgrade.
 
-def loadStats(statsFile):
-    """
-    Loads the statistics object.
-
-    :param str statsFile: file path where the stats object is stored.
-    :returns: HDFStore object with the collected statistics. \
-                stats can be accessed using a key (i.e stats_ version).
+    :param str stats_directory: path to the directory where the stats files are stored. \
+                If None, the directory is taken from the configuration.
+    :return: Pandas dataframe with the collected statistics.
     """
+    stats = pd.DataFrame()
+    if stats_directory is None:
+        stats_directory = STATS_DIRECTORY
     try:
-        hdf = None
-        if os.path.isfile(statsFile):
-            hdf = pd.HDFStore(statsFile, 'r')
+        frames = []
+        legacy_file = os.path.join(stats_directory, 'stats.hdf')
+        if os.path.isfile(legacy_file):
+            with pd.HDFStore(legacy_file, 'r') as store:
+                for key in store.keys():
+                    legacy = store[key]
+                    legacy['Import_flag'] = key.split('_')[0].replace('/', '')
+                    frames.append(legacy)
+        stats_files = glob.glob(os.path.join(stats_directory, '*.parquet'))
+        if len(stats_files) > 0:
+            frames.append(pq.ParquetDataset(stats_files).read().to_pandas())
+        if len(frames) > 0:
+            stats = pd.concat(frames, ignore_index=True, sort=False)
     except Exception as err:
-        logger.error("Loading Stats file:{} > {}.".format(statsFile, err))
+        logger.error("Loading Stats from directory:{} > {}.".format(stats_directory, err))
 
-    return hdf
+    return stats
 
 
-
-def writeStats(statsDf, import_type, stats_name=None):
+def writeStats(stats, import_type, stats_name=None):
     """
-    Appends the new collected statistics to the existing stats object.
-    :param statsDf: a pandas dataframe with the new statistics from the importing.
-    :param str statsName: If the statistics should be stored with a specific name.
+    Writes the new collected statistics as a new Parquet file in the stats directory. \
+    Each call produces its own file, so an import never rewrites or reindexes the \
+    statistics from previous imports, and the directory is read back as one dataset.
+
+    :param stats: an iterable of tuples with the new statistics from the importing.
+    :param str stats_name: If the statistics should be stored with a specific name.
     """
-    stats_directory = ckg_config['stats_directory']
-    stats_file = os.path.join(stats_directory, config["statsFile"])
     try:
         if stats_name is None:
             stats_name = getStatsName(import_type)
-        with pd.HDFStore(stats_file, mode='w') as hdf:
-            hdf.put(key=stats_name, value=statsDf, format='table', append=True, data_columns=True)
+        batch = generateStatsRecordBatch(stats, import_type)
+        stats_file = os.path.join(STATS_DIRECTORY, "{}_{}.parquet".format(stats_name, uuid4()))
+        with pq.ParquetWriter(stats_file, batch.schema, compression='zstd') as writer:
+            # row groups are sized to a power of two kept above the row count of
+            # a typical import, so one import lands in a single aligned group
+            writer.write_table(pa.Table.from_batches([batch]), row_group_size=4096)
     except Exception as err:
-        logger.error("Writing Stats object {} in file:{} > {}.".format(stats_name, stats_file, err))
+        logger.error("Writing Stats object {} in directory:{} > {}.".format(stats_name, STATS_DIRECTORY, err))
 
 
 def getStatsName(import_type):
@@ -255,10 +329,7 @@ def getStatsName(import_type):
     :return: statsName: key used to store in the stats object.
     :rtype: str
     """
-    version = ckg_config['version']
-    statsName = import_type+'_stats_' + str(version).replace('.', '_')
-
-    return statsName
+    return import_type + '_' + STATS_SUFFIX
 
 
 if __name__ == "__main__":
@@ -1,5 +1,7 @@
 from neo4j.meta import experimental
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as arrow_csv
 import csv
 import certifi
 import urllib3
@@ -27,6 +29,13 @@ from ckg.graphdb_connector import connector
 import zipfile
 import rarfile
 
+# Built once at import time so a pyarrow release whose csv writer cannot produce
+# tab-delimited files fails loudly here instead of silently disabling the fast
+# path on every write. quoting_style 'needed' quotes only fields containing the
+# delimiter, quotes or newlines and doubles embedded quotes, which is the
+# format Neo4j LOAD CSV parses by default.
+IMPORT_CSV_WRITE_OPTIONS = arrow_csv.WriteOptions(delimiter='\t', batch_size=65536, quoting_style='needed')
+
 
 def readDataset(uri):
     data = pd.DataFrame()
@@ -269,7 +278,7 @@ def convert_sdrf_file_to_ckg(file_path):
     return df
 
 
-def write_relationships(relationships, header, outputfile):
+def write_relationships(relationships, header, outputfile, output_format='tsv'):
     """
     Reads a set of relationships and saves them to a file.
 
@@ -277,17 +286,19 @@ def write_relationships(relationships, header, outputfile):
                                 relationship type, source and other attributes.
     :param list header: list of column names.
     :param str outputfile: path to file to be saved (including filename and extention).
+    :param str output_format: when 'parquet', a columnar copy of the file is saved alongside \
+                                the tsv loaded into the graph database.
     """
     try:
         df = pd.DataFrame(list(relationships), columns=header)
-        df.to_csv(path_or_buf=outputfile, sep='\t',
-                header=True, index=False, quotechar='"',
-                line_terminator='\n', escapechar='\\')
+        _write_import_file(df, outputfile)
+        if output_format == 'parquet':
+            write_parquet(df, outputfile)
     except Exception as err:
         raise csv.Error("Error writing relationships to file: {}.\n {}".format(outputfile, err))
 
 
-def write_entities(entities, header, outputfile):
+def write_entities(entities, header, outputfile, output_format='tsv'):
     """
     Reads a set of entities and saves them to a file.
 
@@ -295,14 +306,50 @@ def write_entities(entities, header, outputfile):
                         and other attributes.
     :param list header: list of column names.
     :param str outputfile: path to file to be saved (including filename and extention).
+    :param str output_format: when 'parquet', a columnar copy of the file is saved alongside \
+                                the tsv loaded into the graph database.
     """
     try:
         df = pd.DataFrame(list(entities), columns=header)
+        _write_import_file(df, outputfile)
+        if output_format == 'parquet':
+            write_parquet(df, outputfile)
+    except csv.Error as err:
+        raise csv.Error("Error writing etities to file: {}.\n {}".format(outputfile, err))
+
+
+def _write_import_file(df, outputfile):
+    """
+    Saves a dataframe as a tab-delimited import file. Serialization is done by the \
+    Arrow csv writer, which converts whole columns at a time; frames Arrow cannot \
+    convert (e.g. object columns with mixed types) fall back to pandas to_csv with \
+    the escaping the import files always used. The fallback is logged so a \
+    systematically failing Arrow path is visible in the builder log.
+
+    :param df: pandas dataframe with the data to be saved.
+    :param str outputfile: path to file to be saved (including filename and extention).
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        arrow_csv.write_csv(table, outputfile, write_options=IMPORT_CSV_WRITE_OPTIONS)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError) as err:
+        logging.getLogger("builder_utils").warning("Arrow could not serialize {}, falling back to pandas > {}.".format(outputfile, err))
         df.to_csv(path_or_buf=outputfile, sep='\t',
                 header=True, index=False, quotechar='"',
                 line_terminator='\n', escapechar='\\')
-    except csv.Error as err:
-        raise csv.Error("Error writing etities to file: {}.\n {}".format(outputfile, err))
+
+
+def write_parquet(data, outputfile):
+    """
+    Saves a dataframe as a Parquet file next to the given import file. The tsv file \
+    is still the one loaded into the graph database, the Parquet copy is meant for \
+    downstream analytics where columnar reads avoid parsing text.
+
+    :param data: pandas dataframe with the data to be saved.
+    :param str outputfile: path to the tsv import file. The extension is replaced by '.parquet'.
+    """
+    parquet_file = os.path.splitext(outputfile)[0] + '.parquet'
+    data.to_parquet(parquet_file, engine='pyarrow', compression='zstd', row_group_size=200000)
 
 
 def get_config(config_name, data_type='databases'):
@@ -623,15 +670,14 @@ def listDirectoryFiles(directory):
 
 def listDirectoryFolders(directory):
     """
-    Lists all directories in a specified directory.
+    Lists all directories in a specified directory. The listing uses os.scandir, which \
+    returns the entry type with the directory entries so no extra stat call is needed \
+    per entry.
 
     :param str directory: path to folder.
     :return: List of folder names.
     """
-    from os import listdir
-    from os.path import isdir, join
-    dircontent = [f for f in listdir(directory) if isdir(join(directory, f)) and not f.startswith('.')]
-    return dircontent
+    return [entry.name for entry in os.scandir(directory) if entry.is_dir(follow_symlinks=False) and not entry.name.startswith('.')]
 
 
 def listDirectoryFoldersNotEmpty(directory):
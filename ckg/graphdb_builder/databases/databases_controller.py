@@ -16,7 +16,7 @@ except Exception as err:
     logger.error("Reading configuration > {}.".format(err))
 
 
-def parseDatabase(importDirectory, database, download=True):
+def parseDatabase(importDirectory, database, download=True, output_format='tsv'):
     stats = set()
     updated_on = None
     if download:
@@ -29,7 +29,7 @@ def parseDatabase(importDirectory, database, download=True):
             for qtype in result:
                 relationships, header, outputfileName = result[qtype]
                 outputfile = os.path.join(importDirectory, outputfileName)
-                builder_utils.write_relationships(relationships, header, outputfile)
+                builder_utils.write_relationships(relationships, header, outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} relationships: {}".format(database, qtype, len(relationships)))
                 stats.add(builder_utils.buildStats(len(relationships), "relationships", qtype, database, outputfile, updated_on))
             print("Done Parsing database {}".format(database))
@@ -42,7 +42,7 @@ def parseDatabase(importDirectory, database, download=True):
             #HGNC
             entities, header = hgncParser.parser(database_directory, download)
             outputfile = os.path.join(importDirectory, "Gene.tsv")
-            builder_utils.write_entities(entities, header, outputfile)
+            builder_utils.write_entities(entities, header, outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} entities: {}".format(database, "Gene", len(entities)))
             stats.add(builder_utils.buildStats(len(entities), "entity", "Gene", database, outputfile, updated_on))
             print("Done Parsing database {}".format(database))
@@ -51,13 +51,13 @@ def parseDatabase(importDirectory, database, download=True):
             for entity in entities:
                 header = headers[entity]
                 outputfile = os.path.join(importDirectory, entity+".tsv")
-                builder_utils.write_entities(entities[entity], header, outputfile)
+                builder_utils.write_entities(entities[entity], header, outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} entities: {}".format(database, entity, len(entities[entity])))
                 stats.add(builder_utils.buildStats(len(entities[entity]), "entity", entity, database, outputfile, updated_on))
             for rel in relationships:
                 header = headers[rel]
                 outputfile = os.path.join(importDirectory, "refseq_"+rel.lower()+".tsv")
-                builder_utils.write_relationships(relationships[rel], header, outputfile)
+                builder_utils.write_relationships(relationships[rel], header, outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} relationships: {}".format(database, rel, len(relationships[rel])))
                 stats.add(builder_utils.buildStats(len(relationships[rel]), "relationships", rel, database, outputfile, updated_on))
             print("Done Parsing database {}".format(database))
@@ -73,7 +73,7 @@ def parseDatabase(importDirectory, database, download=True):
             #IntAct
             relationships, header, outputfileName = intactParser.parser(database_directory, download)
             outputfile = os.path.join(importDirectory, outputfileName)
-            builder_utils.write_relationships(relationships, header, outputfile)
+            builder_utils.write_relationships(relationships, header, outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} relationships: {}".format(database, "curated_interacts_with", len(relationships)))
             stats.add(builder_utils.buildStats(len(relationships), "relationships", "curated_interacts_with", database, outputfile, updated_on))
             print("Done Parsing database {}".format(database))
@@ -81,7 +81,7 @@ def parseDatabase(importDirectory, database, download=True):
             #MutationDs
             relationships, header, outputfileName = mutationDsParser.parser(database_directory, download)
             outputfile = os.path.join(importDirectory, outputfileName)
-            builder_utils.write_relationships(relationships, header, outputfile)
+            builder_utils.write_relationships(relationships, header, outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} relationships: {}".format(database, "curated_affects_interaction_with", len(relationships)))
             stats.add(builder_utils.buildStats(len(relationships), "relationships", "curated_affects_interaction_with", database, outputfile, updated_on))
             print("Done Parsing database {}".format(database))
@@ -100,7 +100,7 @@ def parseDatabase(importDirectory, database, download=True):
             relationships, header, outputfileName = disgenetParser.parser(database_directory, download)
             for idType in relationships:
                 outputfile = os.path.join(importDirectory, idType+"_"+outputfileName)
-                builder_utils.write_relationships(relationships[idType], header, outputfile)
+                builder_utils.write_relationships(relationships[idType], header, outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} relationships: {}".format(database, idType, len(relationships[idType])))
                 stats.add(builder_utils.buildStats(len(relationships[idType]), "relationships", idType, database, outputfile, updated_on))
             print("Done Parsing database {}".format(database))
@@ -108,10 +108,10 @@ def parseDatabase(importDirectory, database, download=True):
             #PathwayCommons pathways
             entities, relationships, entities_header, relationships_header = pathwayCommonsParser.parser(database_directory, download)
             entity_outputfile = os.path.join(importDirectory, "Pathway.tsv")
-            builder_utils.write_entities(entities, entities_header, entity_outputfile)
+            builder_utils.write_entities(entities, entities_header, entity_outputfile, output_format=output_format)
             stats.add(builder_utils.buildStats(len(entities), "entity", "Pathway", database, entity_outputfile, updated_on))
             pathway_outputfile = os.path.join(importDirectory, "pathwaycommons_protein_associated_with_pathway.tsv")
-            builder_utils.write_relationships(relationships, relationships_header, pathway_outputfile)
+            builder_utils.write_relationships(relationships, relationships_header, pathway_outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} relationships: {}".format(database, "protein_associated_with_pathway", len(relationships)))
             stats.add(builder_utils.buildStats(len(relationships), "relationships", "protein_associated_with_pathway", database, pathway_outputfile, updated_on))
             print("Done Parsing database {}".format(database))
@@ -119,11 +119,11 @@ def parseDatabase(importDirectory, database, download=True):
             #Reactome
             entities, relationships, entities_header, relationships_header = reactomeParser.parser(database_directory, download)
             entity_outputfile = os.path.join(importDirectory, database.lower()+"_Pathway.tsv")
-            builder_utils.write_entities(entities, entities_header, entity_outputfile)
+            builder_utils.write_entities(entities, entities_header, entity_outputfile, output_format=output_format)
             stats.add(builder_utils.buildStats(len(entities), "entity", "Pathway", database, entity_outputfile, updated_on))
             for entity,relationship in relationships:
                 reactome_outputfile = os.path.join(importDirectory, database.lower()+"_"+entity.lower()+"_"+relationship.lower()+".tsv")
-                builder_utils.write_relationships(relationships[(entity, relationship)], relationships_header[entity], reactome_outputfile)
+                builder_utils.write_relationships(relationships[(entity, relationship)], relationships_header[entity], reactome_outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} {} relationships: {}".format(database, entity, relationship, len(relationships[(entity,relationship)])))
                 stats.add(builder_utils.buildStats(len(relationships[(entity,relationship)]), "relationships", relationship, database, reactome_outputfile, updated_on))
             print("Done Parsing database {}".format(database))
@@ -131,37 +131,37 @@ def parseDatabase(importDirectory, database, download=True):
             #SMPDB
             entities, relationships, entities_header, relationships_header = smpdbParser.parser(database_directory, download)
             entity_outputfile = os.path.join(importDirectory, database.lower()+"_Pathway.tsv")
-            builder_utils.write_entities(entities, entities_header, entity_outputfile)
+            builder_utils.write_entities(entities, entities_header, entity_outputfile, output_format=output_format)
             stats.add(builder_utils.buildStats(len(entities), "entity", "Pathway", database, entity_outputfile, updated_on))
             for entity,relationship in relationships:
                 smpdb_outputfile = os.path.join(importDirectory, database.lower()+"_"+entity.lower()+"_"+relationship.lower()+".tsv")
-                builder_utils.write_relationships(relationships[(entity, relationship)], relationships_header[entity], smpdb_outputfile)
+                builder_utils.write_relationships(relationships[(entity, relationship)], relationships_header[entity], smpdb_outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} {} relationships: {}".format(database, entity, relationship, len(relationships[(entity,relationship)])))
                 stats.add(builder_utils.buildStats(len(relationships[(entity,relationship)]), "relationships", relationship, database, smpdb_outputfile, updated_on))
             print("Done Parsing database {}".format(database))
         elif database.lower() == "dgidb":
             relationships, header, outputfileName = drugGeneInteractionDBParser.parser(database_directory, download)
             outputfile = os.path.join(importDirectory, outputfileName)
-            builder_utils.write_relationships(relationships, header, outputfile)
+            builder_utils.write_relationships(relationships, header, outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} relationships: {}".format(database, "targets", len(relationships)))
             stats.add(builder_utils.buildStats(len(relationships), "relationships", "targets", database, outputfile, updated_on))
             print("Done Parsing database {}".format(database))
         elif database.lower() == "sider":
             relationships,header, outputfileName, drugMapping, phenotypeMapping = siderParser.parser(database_directory, dbconfig["sources"]["Drug"], download)
             outputfile = os.path.join(importDirectory, outputfileName)
-            builder_utils.write_relationships(relationships, header, outputfile)
+            builder_utils.write_relationships(relationships, header, outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} relationships: {}".format(database, "has_side_effect", len(relationships)))
             stats.add(builder_utils.buildStats(len(relationships), "relationships", "has_side_effect", database, outputfile, updated_on))
             relationships, header, outputfileName = siderParser.parserIndications(database_directory, drugMapping, phenotypeMapping, download = download)
             outputfile = os.path.join(importDirectory, outputfileName)
-            builder_utils.write_relationships(relationships, header, outputfile)
+            builder_utils.write_relationships(relationships, header, outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} relationships: {}".format(database, "indicated_for", len(relationships)))
             stats.add(builder_utils.buildStats(len(relationships), "relationships", "indicated_for", database, outputfile, updated_on))
             print("Done Parsing database {}".format(database))
         elif database.lower() == "oncokb":
             entities, relationships, entities_header,  relationships_headers = oncokbParser.parser(database_directory, download)
             outputfile = os.path.join(importDirectory, "oncokb_Clinically_relevant_variant.tsv")
-            builder_utils.write_entities(entities, entities_header, outputfile)
+            builder_utils.write_entities(entities, entities_header, outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} entities: {}".format(database, "Clinically_relevant_variant", len(entities)))
             stats.add(builder_utils.buildStats(len(entities), "entity", "Clinically_relevant_variant", database, outputfile, updated_on))
             for relationship in relationships:
@@ -170,14 +170,14 @@ def parseDatabase(importDirectory, database, download=True):
                     header = relationships_headers[relationship]
                 else:
                     header = ['START_ID', 'END_ID','TYPE']
-                builder_utils.write_relationships(relationships[relationship], header, oncokb_outputfile)
+                builder_utils.write_relationships(relationships[relationship], header, oncokb_outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} relationships: {}".format(database, relationship, len(relationships[relationship])))
                 stats.add(builder_utils.buildStats(len(relationships[relationship]), "relationships", relationship, database, outputfile, updated_on))
             print("Done Parsing database {}".format(database))
         elif database.lower() == "cancergenomeinterpreter":
             entities, relationships, entities_header, relationships_headers = cancerGenomeInterpreterParser.parser(database_directory, download)
             entity_outputfile = os.path.join(importDirectory, "cgi_Clinically_relevant_variant.tsv")
-            builder_utils.write_entities(entities, entities_header, entity_outputfile)
+            builder_utils.write_entities(entities, entities_header, entity_outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} entities: {}".format(database, "Clinically_relevant_variant", len(entities)))
             stats.add(builder_utils.buildStats(len(entities), "entity", "Clinically_relevant_variant", database, entity_outputfile, updated_on))
             for relationship in relationships:
@@ -185,26 +185,26 @@ def parseDatabase(importDirectory, database, download=True):
                 header = ['START_ID', 'END_ID','TYPE']
                 if relationship in relationships_headers:
                     header = relationships_headers[relationship]
-                builder_utils.write_relationships(relationships[relationship], header, cgi_outputfile)
+                builder_utils.write_relationships(relationships[relationship], header, cgi_outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} relationships: {}".format(database, relationship, len(relationships[relationship])))
                 stats.add(builder_utils.buildStats(len(relationships[relationship]), "relationships", relationship, database, cgi_outputfile, updated_on))
             print("Done Parsing database {}".format(database))
         elif database.lower() == "hmdb":
             entities, relationships, entities_header, relationships_header = hmdbParser.parser(database_directory, download)
             entity_outputfile = os.path.join(importDirectory, "Metabolite.tsv")
-            builder_utils.write_entities(entities, entities_header, entity_outputfile)
+            builder_utils.write_entities(entities, entities_header, entity_outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} entities: {}".format(database, "Metabolite", len(entities)))
             stats.add(builder_utils.buildStats(len(entities), "entity", "Metabolite", database, entity_outputfile, updated_on))
             for relationship in relationships:
                 hmdb_outputfile = os.path.join(importDirectory, relationship+".tsv")
-                builder_utils.write_relationships(relationships[relationship], relationships_header, hmdb_outputfile)
+                builder_utils.write_relationships(relationships[relationship], relationships_header, hmdb_outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} relationships: {}".format(database, relationship, len(relationships[relationship])))
                 stats.add(builder_utils.buildStats(len(relationships[relationship]), "relationships", relationship, database, hmdb_outputfile, updated_on))
             print("Done Parsing database {}".format(database))
         elif database.lower() == "drugbank":
             entities, relationships, entities_header, relationships_headers = drugBankParser.parser(database_directory)
             entity_outputfile = os.path.join(importDirectory, "Drug.tsv")
-            builder_utils.write_entities(entities, entities_header, entity_outputfile)
+            builder_utils.write_entities(entities, entities_header, entity_outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} entities: {}".format(database, "Drug", len(entities)))
             stats.add(builder_utils.buildStats(len(entities), "entity", "Drug", database, entity_outputfile, updated_on))
             for relationship in relationships:
@@ -212,14 +212,14 @@ def parseDatabase(importDirectory, database, download=True):
                 header = ['START_ID', 'END_ID','TYPE', 'source']
                 if relationship in relationships_headers:
                     header = relationships_headers[relationship]
-                builder_utils.write_relationships(relationships[relationship], header, relationship_outputfile)
+                builder_utils.write_relationships(relationships[relationship], header, relationship_outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} relationships: {}".format(database, relationship, len(relationships[relationship])))
                 stats.add(builder_utils.buildStats(len(relationships[relationship]), "relationships", relationship, database, relationship_outputfile, updated_on))
             print("Done Parsing database {}".format(database))
         elif database.lower() == "gwascatalog":
             entities, relationships, entities_header, relationships_header = gwasCatalogParser.parser(database_directory, download)
             entity_outputfile = os.path.join(importDirectory, "GWAS_study.tsv")
-            builder_utils.write_entities(entities, entities_header, entity_outputfile)
+            builder_utils.write_entities(entities, entities_header, entity_outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} entities: {}".format(database, "GWAS_study", len(entities)))
             stats.add(builder_utils.buildStats(len(entities), "entity", "GWAS_study", database, entity_outputfile, updated_on))
             for relationship in relationships:
@@ -227,14 +227,14 @@ def parseDatabase(importDirectory, database, download=True):
                 if relationship in relationships_header:
                     header = relationships_header[relationship]
                 outputfile = os.path.join(importDirectory, "GWAS_study_"+relationship+".tsv")
-                builder_utils.write_relationships(relationships[relationship], header, outputfile)
+                builder_utils.write_relationships(relationships[relationship], header, outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} relationships: {}".format(database, relationship, len(relationships[relationship])))
                 stats.add(builder_utils.buildStats(len(relationships[relationship]), "relationships", relationship, database, outputfile, updated_on))
             print("Done Parsing database {}".format(database))
         elif database.lower() == "phosphositeplus":
             entities, relationships, entities_header, relationships_headers = pspParser.parser(database_directory)
             entity_outputfile = os.path.join(importDirectory, "psp_Modified_protein.tsv")
-            builder_utils.write_entities(entities, entities_header, entity_outputfile)
+            builder_utils.write_entities(entities, entities_header, entity_outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} entities: {}".format(database, "Modified_protein", len(entities)))
             stats.add(builder_utils.buildStats(len(entities), "entity", "Modified_protein", database, entity_outputfile, updated_on))
             for entity,relationship in relationships:
@@ -242,14 +242,14 @@ def parseDatabase(importDirectory, database, download=True):
                 if entity in relationships_headers:
                     rel_header = relationships_headers[entity]
                 outputfile = os.path.join(importDirectory, "psp_"+entity.lower()+"_"+relationship.lower()+".tsv")
-                builder_utils.write_relationships(relationships[(entity,relationship)], rel_header, outputfile)
+                builder_utils.write_relationships(relationships[(entity,relationship)], rel_header, outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} relationships: {}".format(database, relationship, len(relationships[(entity,relationship)])))
                 stats.add(builder_utils.buildStats(len(relationships[(entity,relationship)]), "relationships", relationship, database, outputfile, updated_on))
             print("Done Parsing database {}".format(database))
         elif database.lower() == "signor":
             entities, relationships, entities_header, relationships_headers = signorParser.parser(database_directory)
             entity_outputfile = os.path.join(importDirectory, "signor_Modified_protein.tsv")
-            builder_utils.write_entities(entities, entities_header, entity_outputfile)
+            builder_utils.write_entities(entities, entities_header, entity_outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} entities: {}".format(database, "Modified_protein", len(entities)))
             stats.add(builder_utils.buildStats(len(entities), "entity", "Modified_protein", database, entity_outputfile, updated_on))
             for entity,relationship in relationships:
@@ -260,31 +260,31 @@ def parseDatabase(importDirectory, database, download=True):
                 if relationship == 'mentioned_in_publication':
                     prefix = entity
                 outputfile = os.path.join(importDirectory, prefix+"_"+relationship.lower()+".tsv")
-                builder_utils.write_relationships(relationships[(entity,relationship)], rel_header, outputfile)
+                builder_utils.write_relationships(relationships[(entity,relationship)], rel_header, outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} relationships: {}".format(database, relationship, len(relationships[(entity,relationship)])))
                 stats.add(builder_utils.buildStats(len(relationships[(entity,relationship)]), "relationships", relationship, database, outputfile, updated_on))
             print("Done Parsing database {}".format(database))
         elif database.lower() == "corum":
             entities, relationships, entities_header, relationships_headers = corumParser.parser(database_directory, download)
             entity_outputfile = os.path.join(importDirectory, "Complex.tsv")
-            builder_utils.write_entities(entities, entities_header, entity_outputfile)
+            builder_utils.write_entities(entities, entities_header, entity_outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} entities: {}".format(database, "Complex", len(entities)))
             stats.add(builder_utils.buildStats(len(entities), "entity", "Complex", database, entity_outputfile, updated_on))
             for entity, relationship in relationships:
                 corum_outputfile = os.path.join(importDirectory, database.lower()+"_"+entity.lower()+"_"+relationship.lower()+".tsv")
-                builder_utils.write_relationships(relationships[(entity,relationship)], relationships_headers[entity], corum_outputfile)
+                builder_utils.write_relationships(relationships[(entity,relationship)], relationships_headers[entity], corum_outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} relationships: {}".format(database, relationship, len(relationships[(entity,relationship)])))
                 stats.add(builder_utils.buildStats(len(relationships[(entity,relationship)]), "relationships", relationship, database, corum_outputfile, updated_on))
             print("Done Parsing database {}".format(database))
         elif database.lower() == "foodb":
             entities, relationships, entities_header, relationships_headers = foodbParser.parser(database_directory, download)
             entity_outputfile = os.path.join(importDirectory, "Food.tsv")
-            builder_utils.write_entities(entities, entities_header, entity_outputfile)
+            builder_utils.write_entities(entities, entities_header, entity_outputfile, output_format=output_format)
             logger.info("Database {} - Number of {} entities: {}".format(database, "Food", len(entities)))
             stats.add(builder_utils.buildStats(len(entities), "entity", "Food", database, entity_outputfile, updated_on))
             for entity, relationship in relationships:
                 foodb_outputfile = os.path.join(importDirectory, database.lower()+"_"+entity.lower()+"_"+relationship.lower()+".tsv")
-                builder_utils.write_relationships(relationships[(entity,relationship)], relationships_headers[entity], foodb_outputfile)
+                builder_utils.write_relationships(relationships[(entity,relationship)], relationships_headers[entity], foodb_outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} relationships: {}".format(database, relationship, len(relationships[(entity,relationship)])))
                 stats.add(builder_utils.buildStats(len(relationships[(entity,relationship)]), "relationships", relationship, database, foodb_outputfile, updated_on))
             print("Done Parsing database {}".format(database))
@@ -292,7 +292,7 @@ def parseDatabase(importDirectory, database, download=True):
             relationships, header = exposomeParser.parser(database_directory, download)
             for entity, relationship in relationships:
                 ee_outputfile = os.path.join(importDirectory, database.lower()+"_"+entity.lower()+"_"+relationship.lower()+".tsv")
-                builder_utils.write_relationships(relationships[(entity,relationship)], header[entity], ee_outputfile)
+                builder_utils.write_relationships(relationships[(entity,relationship)], header[entity], ee_outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} relationships: {}".format(database, relationship, len(relationships[(entity,relationship)])))
                 stats.add(builder_utils.buildStats(len(relationships[(entity,relationship)]), "relationships", relationship, database, ee_outputfile, updated_on))
             print("Done Parsing database {}".format(database))
@@ -300,7 +300,7 @@ def parseDatabase(importDirectory, database, download=True):
             relationships, headers = hpaParser.parser(database_directory, download)
             for entity, relationship in relationships:
                 hpa_outputfile = os.path.join(importDirectory, database.lower()+"_"+entity.lower()+"_"+relationship.lower()+".tsv")
-                builder_utils.write_relationships(relationships[(entity,relationship)], headers[relationship], hpa_outputfile)
+                builder_utils.write_relationships(relationships[(entity,relationship)], headers[relationship], hpa_outputfile, output_format=output_format)
                 logger.info("Database {} - Number of {} relationships: {}".format(database, relationship, len(relationships[(entity,relationship)])))
                 stats.add(builder_utils.buildStats(len(relationships[(entity,relationship)]), "relationships", relationship, database, hpa_outputfile, updated_on))
             print("Done Parsing database {}".format(database))
@@ -314,10 +314,10 @@ def parseDatabase(importDirectory, database, download=True):
 #########################
 #       Graph files     #
 #########################
-def generateGraphFiles(importDirectory, databases=None, download=True, n_jobs = 4):
+def generateGraphFiles(importDirectory, databases=None, download=True, n_jobs = 4, output_format='tsv'):
     if databases is None:
         databases = dbconfig["databases"]
-    stats = Parallel(n_jobs=n_jobs)(delayed(parseDatabase)(importDirectory,database, download) for database in databases)
+    stats = Parallel(n_jobs=n_jobs, prefer='threads', batch_size='auto', pre_dispatch='2*n_jobs')(delayed(parseDatabase)(importDirectory,database, download, output_format) for database in databases)
     allstats = {val if type(sublist) == set else sublist for sublist in stats for val in sublist}
     return allstats
 
@@ -1,5 +1,6 @@
 import sys
 import os.path
+from concurrent.futures import ThreadPoolExecutor
 from ckg.graphdb_builder import builder_utils
 from ckg.graphdb_builder.experiments.parsers import clinicalParser, proteomicsParser, wesParser
 from ckg import ckg_utils
@@ -33,6 +34,53 @@ def generate_dataset_imports(projectId, dataType, dataset_import_dir):
         logger.error("Error: {}. Experiment {}: {} file: {}, line: {}".format(err, projectId, sys.exc_info(), fname, exc_tb.tb_lineno))
         raise Exception("Error {}. Importing experiment {}. Data type {}.".format(err, projectId, dataType))
 
+    return stats
+
+
+def generate_dataset_imports_batch(projectId, dataTypes, project_import_dir, max_workers=None):
+    """
+    Generates the import files for all the datasets of a project in one call. The \
+    'project' and 'experimental_design' datasets are imported first and in order since \
+    the remaining datasets depend on them, and the rest of the datasets are parsed \
+    concurrently in a thread pool so a single large project can use several cores.
+
+    :param str projectId: identifier of the project to be imported.
+    :param list dataTypes: dataset types available for the project.
+    :param str project_import_dir: path to the directory where the project import files are generated.
+    :param int max_workers: number of threads used to parse the datasets. If None, \
+                sized to the number of datasets, capped at 16. Callers that already \
+                parallelize across projects should pass a small value to avoid \
+                oversubscribing the machine with nested pools.
+    :return: Set of tuples with the statistics collected from each dataset.
+    """
+    stats = set()
+    dataTypes = list(dataTypes)
+    os.makedirs(project_import_dir, exist_ok=True)
+    if 'project' in dataTypes:
+        datasets = []
+        to_import = ['project']
+        if 'experimental_design' in dataTypes:
+            datasets = [dataset for dataset in dataTypes if dataset not in ('project', 'experimental_design')]
+            to_import = to_import + ['experimental_design'] + datasets
+        # pre-create the directories of the datasets that will be imported in
+        # one scandir pass instead of one exists/makedirs round-trip per dataset
+        existing = {entry.name for entry in os.scandir(project_import_dir) if entry.is_dir(follow_symlinks=False)}
+        for dataset in to_import:
+            if dataset not in existing:
+                os.makedirs(os.path.join(project_import_dir, dataset), exist_ok=True)
+        stats.update(generate_dataset_imports(projectId, 'project', os.path.join(project_import_dir, 'project')))
+        if 'experimental_design' in dataTypes:
+            stats.update(generate_dataset_imports(projectId, 'experimental_design', os.path.join(project_import_dir, 'experimental_design')))
+            if len(datasets) > 0:
+                if max_workers is None:
+                    max_workers = 16
+                max_workers = max(1, min(max_workers, len(datasets)))
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for dataset_stats in executor.map(lambda dataset: generate_dataset_imports(projectId, dataset, os.path.join(project_import_dir, dataset)), datasets, chunksize=8):
+                        stats.update(dataset_stats)
+
+    return stats
+
 
 def generate_graph_files(data, dataType, projectId, stats, ot='w', dataset_import_dir='experiments'):
     if dataType == '':
@@ -100,7 +100,7 @@ def parse_ontology(ontology, download=True):
     return ontologyData, mappings, extra_entities, extra_rels
 
 
-def generate_graphFiles(import_directory, ontologies=None, download=True):
+def generate_graphFiles(import_directory, ontologies=None, download=True, output_format='tsv'):
     """
     This function parses and extracts data from a given list of ontologies. If no ontologies are provided, \
     all availables ontologies are used. Terms, relationships and definitions are saved as .tsv files to be loaded into \
@@ -110,6 +110,8 @@ def generate_graphFiles(import_directory, ontologies=None, download=True):
     :param ontologies: list of ontologies to be imported. If None, all available ontologies are imported.
     :type ontologies: list or None
     :param bool download: wether database is to be downloaded.
+    :param str output_format: when 'parquet', a columnar copy of each relationships file is \
+            saved alongside the tsv loaded into the graph database.
     :return: Dictionary of tuples. Each tuple corresponds to a unique label/relationship type, date, time, \
             database, and number of nodes and relationships.
     """
@@ -160,6 +162,8 @@ def generate_graphFiles(import_directory, ontologies=None, download=True):
                                                         header=True, index=False, quotechar='"',
                                                         quoting=csv.QUOTE_ALL,
                                                         line_terminator='\n', escapechar='\\')
+                            if output_format == 'parquet':
+                                builder_utils.write_parquet(relationshipsDf, relationships_outputfile)
                             logger.info("Ontology {} - Number of {} relationships: {}".format(ontology, name+"_has_parent", len(relationships[namespace])))
                             stats.add(builder_utils.buildStats(len(relationships[namespace]), "relationships", name+"_has_parent", ontology, relationships_outputfile, updated_on))
             else:
@@ -174,6 +178,8 @@ def generate_graphFiles(import_directory, ontologies=None, download=True):
                                                 header=True, index=False, quotechar='"',
                                                 quoting=csv.QUOTE_ALL,
                                                 line_terminator='\n', escapechar='\\')
+                    if output_format == 'parquet':
+                        builder_utils.write_parquet(mappingsDf, mappings_outputfile)
                     logger.info("Ontology {} - Number of {} relationships: {}".format(ontology, name, len(mappings[name])))
                     stats.add(builder_utils.buildStats(len(mappings[name]), "relationships", name, ontology, mappings_outputfile, updated_on))
         except Exception as err:
@@ -1,4 +1,4 @@
-stats_file = "../../data/imports/stats/stats.hdf"
+stats_directory = "../../data/imports/stats"
 
 logo = '../static/img/logo.png'
 
@@ -55,7 +55,7 @@ pages = {"projectPage":{
                 "proteomics": proteomicsPage,
                 #"wes": wesPage
                 },
-            "importsPage":{"stats_file":stats_file},
+            "importsPage":{"stats_directory":stats_directory},
             "projectCreationPage":{}
             }
 ## Overview 
@@ -1,35 +1,46 @@
+import glob
+import os
 from ckg.analytics_core.viz import viz
 import dash_core_components as dcc
 import plotly.graph_objs as go
 import plotly.subplots as tools
 import pandas as pd
+import pyarrow.parquet as pq
 import numpy as np
 from itertools import chain
 from collections import defaultdict
 from natsort import natsorted
 
 
-def get_stats_data(filename, n=3):
+def get_stats_data(stats_directory, n=3):
     """
-    Reads graph database stats file and filters for the last 'n' full and partial independent \
-    imports, returning a Pandas DataFrame.
+    Reads the graph database stats files and filters for the last 'n' full and partial \
+    independent imports, returning a Pandas DataFrame. Statistics accumulated by \
+    previous versions in the 'stats.hdf' file are read as well, so the import history \
+    is kept after an upgrade.
 
-    :param str filename: path to stats file (including filename and '.hdf' extension).
+    :param str stats_directory: path to the directory where the stats files are stored.
     :param int n: number of independent imports to plot.
     :return: Pandas Dataframe with different entities and relationships as rows and columns:
     """
     df = pd.DataFrame()
-    with pd.HDFStore(filename, 'r') as store:
-        for key in store.keys():
-            k = key.split('_')[0].replace('/', '')
-            if df.empty:
-                df = store[key].copy()
-                df['Import_flag'] = k
-            else:
-                aux = store[key]
-                aux['Import_flag']= k
-                df = df.append(aux)
-    
+    frames = []
+    legacy_file = os.path.join(stats_directory, 'stats.hdf')
+    if os.path.isfile(legacy_file):
+        with pd.HDFStore(legacy_file, 'r') as store:
+            for key in store.keys():
+                legacy = store[key]
+                legacy['Import_flag'] = key.split('_')[0].replace('/', '')
+                frames.append(legacy)
+    stats_files = glob.glob(os.path.join(stats_directory, '*.parquet'))
+    if len(stats_files) > 0:
+        frames.append(pq.ParquetDataset(stats_files).read().to_pandas())
+    if len(frames) > 0:
+        df = pd.concat(frames, ignore_index=True, sort=False)
+        for col in ('file_size', 'Imported_number'):
+            if col in df:
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+
     if not df.empty:
         df['datetime'] = pd.to_datetime(df['date']+' '+df['time'])
         imp = select_last_n_imports(df, n=n)
@@ -1,3 +1,4 @@
+import glob
 import os
 from ckg import ckg_utils
 from ckg.report_manager.apps import basicApp
@@ -22,9 +23,8 @@ class ImportsApp(basicApp.BasicApp):
         plots = []
         self.add_basic_layout()
         stats_dir = ckg_utils.read_ckg_config(key='stats_directory')
-        stats_file = os.path.join(stats_dir, "stats.hdf")
-        if os.path.exists(stats_file):
-            stats_df = imports.get_stats_data(stats_file, n=3)
+        if os.path.isdir(stats_dir) and (len(glob.glob(os.path.join(stats_dir, "*.parquet"))) > 0 or os.path.isfile(os.path.join(stats_dir, "stats.hdf"))):
+            stats_df = imports.get_stats_data(stats_dir, n=3)
             plots.append(imports.plot_total_number_imported(stats_df, 'Number of imported entities and relationships'))
             plots.append(imports.plot_total_numbers_per_date(stats_df, 'Imported entities vs relationships'))
             plots.append(imports.plot_databases_numbers_per_date(stats_df, 'Full imports: entities/relationships per database', key='full', dropdown=True, dropdown_options='dates'))